@@ -1,12 +1,17 @@
 import streamlit as st
 import google.generativeai as genai
-import json
+import orjson
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 from datetime import datetime
 import os
 import re
+import hashlib
+import queue
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from dotenv import load_dotenv
 
 # Configure page
@@ -28,6 +33,82 @@ if not GEMINI_API_KEY:
 else:
     genai.configure(api_key=GEMINI_API_KEY)
 
+@st.cache_resource
+def get_model():
+    """Gemini model built once per process and shared by reruns and worker threads"""
+    return genai.GenerativeModel('gemini-2.5-flash')
+
+# Upper bound on concurrent Gemini requests
+MAX_EXTRACTION_WORKERS = 8
+
+TRANSACTION_CATEGORIES = [
+    "Food & Dining", "Shopping", "Transport", "Travel", "Entertainment",
+    "Groceries", "Bills & Utilities", "Payment", "Other"
+]
+
+# Structure Gemini must return; enforced server-side so the reply is always bare JSON
+STATEMENT_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "issuer": {"type": "STRING"},
+        "customer_name": {"type": "STRING"},
+        "card_type": {"type": "STRING"},
+        "card_last_4": {"type": "STRING"},
+        "statement_period": {
+            "type": "OBJECT",
+            "properties": {
+                "from": {"type": "STRING"},
+                "to": {"type": "STRING"}
+            },
+            "required": ["from", "to"]
+        },
+        "payment_due_date": {"type": "STRING"},
+        "credit_limit": {"type": "STRING"},
+        "available_credit_limit": {"type": "STRING"},
+        "total_amount_due": {"type": "STRING"},
+        "minimum_amount_due": {"type": "STRING"},
+        "transactions": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "date": {"type": "STRING"},
+                    "description": {"type": "STRING"},
+                    "amount": {"type": "STRING"},
+                    "type": {"type": "STRING", "format": "enum", "enum": ["Debit", "Credit"]},
+                    "category": {"type": "STRING", "format": "enum", "enum": TRANSACTION_CATEGORIES}
+                },
+                "required": ["date", "description", "amount", "type", "category"]
+            }
+        },
+        "insights": {
+            "type": "ARRAY",
+            "items": {"type": "STRING"}
+        }
+    },
+    "required": [
+        "issuer", "customer_name", "card_type", "card_last_4", "statement_period",
+        "payment_due_date", "credit_limit", "available_credit_limit", "total_amount_due",
+        "minimum_amount_due", "transactions", "insights"
+    ]
+}
+
+GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": STATEMENT_SCHEMA
+}
+
+# Shared chart styling, registered once instead of restyled on every figure
+pio.templates['cc'] = go.layout.Template(
+    layout=dict(
+        height=400,
+        colorway=px.colors.qualitative.Set3,
+        piecolorway=px.colors.qualitative.Set3
+    ),
+    data=dict(pie=[go.Pie(hole=0.4, textposition='inside', textinfo='percent+label')])
+)
+pio.templates.default = 'plotly+cc'
+
 # Initialize session state
 if 'all_statements' not in st.session_state:
     st.session_state.all_statements = []
@@ -35,20 +116,54 @@ if 'processing_complete' not in st.session_state:
     st.session_state.processing_complete = False
 if 'last_upload_count' not in st.session_state:
     st.session_state.last_upload_count = 0
+if 'df_all_txns' not in st.session_state:
+    st.session_state.df_all_txns = pd.DataFrame()
+if 'card_summary' not in st.session_state:
+    st.session_state.card_summary = pd.DataFrame()
 
-def parse_amount(amount_str):
-    """Extract numeric value from any currency string"""
-    numeric_str = re.sub(r'[^\d.-]', '', str(amount_str))
-    try:
-        return float(numeric_str)
-    except:
-        return 0.0
+# Strips everything except digits, decimal point and sign from amounts
+_AMOUNT_RE = re.compile(r'[^\d.-]')
 
-def extract_data_from_file(uploaded_file, file_index, total_files):
+def parse_amounts(amounts):
+    """Extract numeric values from a Series of currency strings"""
+    # Missing amounts become '' so they parse to 0.0; astype(str) keeps NaN on pandas 3
+    cleaned = amounts.fillna('').astype(str).str.replace(_AMOUNT_RE, '', regex=True)
+    # Always float64, even when every amount is a whole number
+    return pd.to_numeric(cleaned, errors='coerce').fillna(0.0).astype('float64')
+
+def cache_key(obj):
+    """Stable SHA-256 of JSON-serialisable data, used as a cache key"""
+    return hashlib.sha256(orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+@st.cache_data(show_spinner=False)
+def extract_with_gemini(file_hash, file_type, _file_data, _on_chunk=None):
+    """Send file bytes to Gemini and parse the JSON reply, cached by content hash"""
+    # Failures raise instead of returning an error so they are never cached
+    prompt = (
+        "Extract the structured financial data from this credit card statement (PDF or image). "
+        "Include ALL transactions, write dates as DD-MMM-YYYY and amounts with their currency, "
+        "and provide 3-5 meaningful insights about the spending patterns."
+    )
+    
+    file_part = {
+        "mime_type": file_type,
+        "data": _file_data
+    }
+    
+    # Stream the reply so progress can be reported while the model is still generating
+    chunks = []
+    for chunk in get_model().generate_content([prompt, file_part], generation_config=GENERATION_CONFIG, stream=True):
+        chunks.append(chunk.text)
+        if _on_chunk:
+            _on_chunk(len(chunk.text))
+    
+    return orjson.loads(''.join(chunks))
+
+def extract_data_from_file(uploaded_file, file_index, total_files, progress_queue=None):
     """Send PDF/Image to Gemini and extract structured data"""
     try:
-        uploaded_file.seek(0)
-        file_data = uploaded_file.read()
+        # getvalue() returns the whole buffer without seeking or a read() copy
+        file_data = uploaded_file.getvalue()
         
         file_type = uploaded_file.type
         if not file_type:
@@ -57,176 +172,129 @@ def extract_data_from_file(uploaded_file, file_index, total_files):
             elif uploaded_file.name.lower().endswith(('.png', '.jpg', '.jpeg')):
                 file_type = f"image/{uploaded_file.name.split('.')[-1].lower()}"
         
-        model = genai.GenerativeModel('gemini-2.5-flash')
-        
-        prompt = """
-        Extract structured financial data from this credit card statement (PDF or Image).
-        
-        Return ONLY a valid JSON object with the following structure (no markdown, no code blocks):
-        {
-          "issuer": "Bank Name",
-          "customer_name": "Customer Name",
-          "card_type": "Card Type",
-          "card_last_4": "last 4 digits",
-          "statement_period": {
-            "from": "DD-MMM-YYYY",
-            "to": "DD-MMM-YYYY"
-          },
-          "payment_due_date": "DD-MMM-YYYY",
-          "credit_limit": "Amount with currency",
-          "available_credit_limit": "Amount with currency",
-          "total_amount_due": "Amount with currency",
-          "minimum_amount_due": "Amount with currency",
-          "transactions": [
-            {
-              "date": "DD-MMM-YYYY",
-              "description": "Transaction description",
-              "amount": "Amount with currency",
-              "type": "Debit or Credit",
-              "category": "Category name"
-            }
-          ],
-          "insights": [
-            "Insight 1",
-            "Insight 2",
-            "Insight 3"
-          ]
-        }
-        
-        Important:
-        - For transactions, categorize them into: Food & Dining, Shopping, Transport, Travel, Entertainment, Groceries, Bills & Utilities, Payment, Other
-        - Extract ALL transactions from the statement
-        - Provide at least 3-5 meaningful insights about spending patterns
-        - Return ONLY the JSON, no additional text or markdown
-        """
-        
-        file_part = {
-            "mime_type": file_type,
-            "data": file_data
-        }
-        
-        response = model.generate_content([prompt, file_part])
-        response_text = response.text.strip()
-        
-        if response_text.startswith("```json"):
-            response_text = response_text[7:]
-        if response_text.startswith("```"):
-            response_text = response_text[3:]
-        if response_text.endswith("```"):
-            response_text = response_text[:-3]
-        
-        response_text = response_text.strip()
-        data = json.loads(response_text)
+        # Re-uploads of the same file are served from cache without a Gemini call
+        file_hash = hashlib.sha256(file_data).hexdigest()
+        on_chunk = progress_queue.put if progress_queue is not None else None
+        data = extract_with_gemini(file_hash, file_type, file_data, on_chunk)
         data['filename'] = uploaded_file.name
         
         return data, None
     
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         return None, f"JSON parsing error in {uploaded_file.name}: {str(e)}"
     except Exception as e:
         return None, f"Error processing {uploaded_file.name}: {str(e)}"
 
-def create_aggregate_category_chart(all_statements):
-    """Create pie chart for combined spending across all cards"""
-    all_transactions = []
-    for stmt in all_statements:
-        if 'transactions' in stmt:
-            for txn in stmt['transactions']:
-                if txn.get('type', '').lower() == 'debit':
-                    all_transactions.append({
-                        'category': txn.get('category', 'Other'),
-                        'amount': parse_amount(txn.get('amount', '0'))
-                    })
-    
-    if not all_transactions:
+def build_transactions_frame(statements):
+    """Combine all transactions into one DataFrame tagged with card and numeric amount"""
+    frames = []
+    for stmt in statements:
+        if stmt.get('transactions'):
+            card_id = f"{stmt.get('issuer', 'Unknown')} *{stmt.get('card_last_4', '****')}"
+            frames.append(pd.DataFrame(stmt['transactions']).assign(card=card_id))
+    
+    if not frames:
+        return pd.DataFrame()
+    
+    df = pd.concat(frames, ignore_index=True)
+    df['amount_numeric'] = parse_amounts(df['amount']) if 'amount' in df.columns else 0.0
+    return df
+
+def build_card_summary(statements):
+    """Column-wise view of the statement-level fields, with amounts parsed once"""
+    df = pd.DataFrame(statements).reindex(columns=[
+        'issuer', 'card_type', 'card_last_4', 'payment_due_date',
+        'total_amount_due', 'credit_limit', 'available_credit_limit'
+    ])
+    
+    return pd.DataFrame({
+        'card': df['issuer'].fillna('Unknown').astype(str) + ' *' + df['card_last_4'].fillna('****').astype(str),
+        'issuer': df['issuer'],
+        'card_type': df['card_type'],
+        'card_last_4': df['card_last_4'],
+        'payment_due_date': df['payment_due_date'],
+        'total_due': parse_amounts(df['total_amount_due']),
+        'credit_limit': parse_amounts(df['credit_limit']),
+        'available_credit': parse_amounts(df['available_credit_limit'])
+    })
+
+def category_spending(transactions):
+    """Total debit spending per category, largest first (None if no debits)"""
+    if transactions.empty or 'type' not in transactions.columns:
+        return None
+    
+    debits = transactions[transactions['type'].astype(str).str.lower().eq('debit')]
+    if debits.empty:
         return None
     
-    df = pd.DataFrame(all_transactions)
-    category_spending = df.groupby('category')['amount'].sum().reset_index()
-    category_spending = category_spending.sort_values('amount', ascending=False)
+    spending = pd.DataFrame({
+        'category': debits['category'].fillna('Other') if 'category' in debits.columns else 'Other',
+        'amount': debits['amount_numeric']
+    }, index=debits.index)
+    
+    return (
+        spending.groupby('category', sort=False)['amount'].sum()
+        .sort_values(ascending=False)
+        .reset_index()
+    )
+
+@st.cache_data(show_spinner=False)
+def create_aggregate_category_chart(portfolio_key, _df_all_txns):
+    """Create pie chart for combined spending across all cards"""
+    df = category_spending(_df_all_txns)
+    if df is None:
+        return None
     
     fig = px.pie(
-        category_spending,
+        df,
         values='amount',
         names='category',
-        title='Combined Spending by Category',
-        hole=0.4,
-        color_discrete_sequence=px.colors.qualitative.Set3
+        title='Combined Spending by Category'
     )
     
-    fig.update_traces(textposition='inside', textinfo='percent+label')
-    fig.update_layout(height=400)
-    
     return fig
 
-def create_card_comparison_chart(all_statements):
+@st.cache_data(show_spinner=False)
+def create_card_comparison_chart(portfolio_key, _card_summary):
     """Create bar chart comparing spending across cards"""
-    card_data = []
-    for stmt in all_statements:
-        card_name = f"{stmt.get('issuer', 'Unknown')} *{stmt.get('card_last_4', '****')}"
-        total_due = parse_amount(stmt.get('total_amount_due', '0'))
-        credit_limit = parse_amount(stmt.get('credit_limit', '0'))
-        
-        card_data.append({
-            'Card': card_name,
-            'Total Due': total_due,
-            'Credit Limit': credit_limit,
-            'Utilization %': (total_due / credit_limit * 100) if credit_limit > 0 else 0
-        })
-    
-    df = pd.DataFrame(card_data)
-    
     fig = go.Figure()
     fig.add_trace(go.Bar(
         name='Total Due',
-        x=df['Card'],
-        y=df['Total Due'],
+        x=_card_summary['card'],
+        y=_card_summary['total_due'],
         marker_color='#FF6B6B'
     ))
     fig.add_trace(go.Bar(
         name='Credit Limit',
-        x=df['Card'],
-        y=df['Credit Limit'],
+        x=_card_summary['card'],
+        y=_card_summary['credit_limit'],
         marker_color='#4ECDC4'
     ))
     
     fig.update_layout(
         title='Card-wise Comparison',
         barmode='group',
-        height=400,
         xaxis_title='Cards',
         yaxis_title='Amount'
     )
     
     return fig
 
-def create_individual_category_chart(statement):
+@st.cache_data(show_spinner=False)
+def create_individual_category_chart(statement_key, _statement):
     """Create pie chart for individual card spending"""
-    transactions = statement.get('transactions', [])
-    debit_txns = [txn for txn in transactions if txn.get('type', '').lower() == 'debit']
-    
-    if not debit_txns:
+    df = category_spending(build_transactions_frame([_statement]))
+    if df is None:
         return None
     
-    category_data = {}
-    for txn in debit_txns:
-        category = txn.get('category', 'Other')
-        amount = parse_amount(txn.get('amount', '0'))
-        category_data[category] = category_data.get(category, 0) + amount
-    
-    df = pd.DataFrame(list(category_data.items()), columns=['category', 'amount'])
-    df = df.sort_values('amount', ascending=False)
-    
     fig = px.pie(
         df,
         values='amount',
         names='category',
         title='Spending by Category',
-        hole=0.4,
         color_discrete_sequence=px.colors.qualitative.Pastel
     )
     
-    fig.update_traces(textposition='inside', textinfo='percent+label')
     fig.update_layout(height=350)
     
     return fig
@@ -280,6 +348,8 @@ if uploaded_files:
     if current_upload_count != st.session_state.last_upload_count:
         st.session_state.last_upload_count = current_upload_count
         st.session_state.all_statements = []
+        st.session_state.df_all_txns = pd.DataFrame()
+        st.session_state.card_summary = pd.DataFrame()
         st.session_state.processing_complete = False
     
     # Process if not already done
@@ -287,25 +357,58 @@ if uploaded_files:
         progress_bar = st.progress(0)
         status_text = st.empty()
         
-        for idx, uploaded_file in enumerate(uploaded_files):
-            status_text.text(f"🤖 Analyzing statement {idx + 1} of {len(uploaded_files)}: {uploaded_file.name}")
-            progress_bar.progress((idx) / len(uploaded_files))
-            
-            data, error = extract_data_from_file(uploaded_file, idx + 1, len(uploaded_files))
+        total_files = len(uploaded_files)
+        status_text.text(f"🤖 Analyzing {total_files} statement(s)...")
+        
+        # Gemini calls are independent and I/O-bound, so run them concurrently
+        results = [None] * total_files
+        progress_queue = queue.Queue()
+        chars_received = 0
+        done_count = 0
+        with ThreadPoolExecutor(max_workers=min(MAX_EXTRACTION_WORKERS, total_files)) as executor:
+            futures = {
+                executor.submit(extract_data_from_file, uploaded_file, idx + 1, total_files, progress_queue): idx
+                for idx, uploaded_file in enumerate(uploaded_files)
+            }
             
+            # Workers only report through the queue; all Streamlit updates happen here
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, timeout=0.25, return_when=FIRST_COMPLETED)
+                
+                while True:
+                    try:
+                        chars_received += progress_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                
+                for future in done:
+                    results[futures[future]] = future.result()
+                    done_count += 1
+                
+                status_text.text(f"🤖 Analyzed {done_count} of {total_files} statements ({chars_received:,} characters received)")
+                progress_bar.progress(done_count / total_files)
+        
+        # Keep statements in upload order regardless of completion order
+        for data, error in results:
             if error:
                 st.error(f"❌ {error}")
             else:
                 st.session_state.all_statements.append(data)
         
-        progress_bar.progress(100)
+        progress_bar.empty()
         status_text.text(f"✅ Successfully analyzed {len(st.session_state.all_statements)} of {len(uploaded_files)} statements!")
+        st.session_state.df_all_txns = build_transactions_frame(st.session_state.all_statements)
+        st.session_state.card_summary = build_card_summary(st.session_state.all_statements)
+        # Results render further down in this same run, so no st.rerun() is needed
         st.session_state.processing_complete = True
-        st.rerun()
 
 # Display results
 if st.session_state.all_statements:
     all_statements = st.session_state.all_statements
+    df_all_txns = st.session_state.df_all_txns
+    card_summary = st.session_state.card_summary
+    portfolio_key = cache_key(all_statements)
     
     st.divider()
     
@@ -314,9 +417,9 @@ if st.session_state.all_statements:
     
     # Calculate aggregate metrics
     total_cards = len(all_statements)
-    total_due = sum(parse_amount(stmt.get('total_amount_due', '0')) for stmt in all_statements)
-    total_credit = sum(parse_amount(stmt.get('credit_limit', '0')) for stmt in all_statements)
-    total_available = sum(parse_amount(stmt.get('available_credit_limit', '0')) for stmt in all_statements)
+    total_due = card_summary['total_due'].sum()
+    total_credit = card_summary['credit_limit'].sum()
+    total_available = card_summary['available_credit'].sum()
     avg_utilization = (total_due / total_credit * 100) if total_credit > 0 else 0
     
     col1, col2, col3, col4 = st.columns(4)
@@ -338,12 +441,12 @@ if st.session_state.all_statements:
     col1, col2 = st.columns(2)
     
     with col1:
-        fig_agg_category = create_aggregate_category_chart(all_statements)
+        fig_agg_category = create_aggregate_category_chart(portfolio_key, df_all_txns)
         if fig_agg_category:
             st.plotly_chart(fig_agg_category, use_container_width=True)
     
     with col2:
-        fig_comparison = create_card_comparison_chart(all_statements)
+        fig_comparison = create_card_comparison_chart(portfolio_key, card_summary)
         if fig_comparison:
             st.plotly_chart(fig_comparison, use_container_width=True)
     
@@ -352,118 +455,137 @@ if st.session_state.all_statements:
     # Card Comparison Table
     st.header("🔄 Card Comparison")
     
-    comparison_data = []
-    for stmt in all_statements:
-        comparison_data.append({
-            'Issuer': stmt.get('issuer', 'N/A'),
-            'Card Type': stmt.get('card_type', 'N/A'),
-            'Last 4 Digits': stmt.get('card_last_4', 'N/A'),
-            'Total Due': stmt.get('total_amount_due', 'N/A'),
-            'Credit Limit': stmt.get('credit_limit', 'N/A'),
-            'Due Date': stmt.get('payment_due_date', 'N/A'),
-            'Utilization': f"{(parse_amount(stmt.get('total_amount_due', '0')) / parse_amount(stmt.get('credit_limit', '1')) * 100):.1f}%" if parse_amount(stmt.get('credit_limit', '0')) > 0 else 'N/A'
-        })
-    
-    df_comparison = pd.DataFrame(comparison_data)
-    st.dataframe(df_comparison, use_container_width=True, hide_index=True)
+    df_comparison = pd.DataFrame({
+        'Issuer': card_summary['issuer'].fillna('N/A'),
+        'Card Type': card_summary['card_type'].fillna('N/A'),
+        'Last 4 Digits': card_summary['card_last_4'].fillna('N/A'),
+        'Total Due': card_summary['total_due'],
+        'Credit Limit': card_summary['credit_limit'],
+        'Due Date': card_summary['payment_due_date'].fillna('N/A')
+    })
+    
+    # One masked divide for every card instead of a per-row branch
+    due_values = df_comparison['Total Due'].to_numpy()
+    limit_values = df_comparison['Credit Limit'].to_numpy()
+    has_limit = limit_values > 0
+    utilization = np.divide(due_values, limit_values, out=np.zeros(len(limit_values), dtype=float), where=has_limit) * 100
+    df_comparison['Utilization'] = pd.Series(utilization).map('{:.1f}%'.format).where(has_limit, 'N/A')
+    st.dataframe(
+        df_comparison,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Total Due": st.column_config.NumberColumn("Total Due", format="₹%.2f"),
+            "Credit Limit": st.column_config.NumberColumn("Credit Limit", format="₹%.2f")
+        }
+    )
     
     st.divider()
     
-    # Individual Card Details (Tabs)
+    # Individual Card Details
     st.header("💳 Individual Card Details")
     
-    # Create tabs for each card
-    tab_names = [f"{stmt.get('issuer', 'Card')} *{stmt.get('card_last_4', '****')}" for stmt in all_statements]
-    tabs = st.tabs(tab_names)
+    # Render only the selected card instead of building every card's tab on each rerun
+    card_names = [f"{stmt.get('issuer', 'Card')} *{stmt.get('card_last_4', '****')}" for stmt in all_statements]
+    selected_idx = st.selectbox(
+        "Select card",
+        range(len(all_statements)),
+        format_func=lambda i: card_names[i]
+    )
+    stmt = all_statements[selected_idx]
     
-    for idx, tab in enumerate(tabs):
-        with tab:
-            stmt = all_statements[idx]
-            
-            # Card Information
-            st.subheader("💳 Card Information")
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                st.metric("Issuer", stmt.get('issuer', 'N/A'))
-                st.metric("Card Type", stmt.get('card_type', 'N/A'))
-            
-            with col2:
-                st.metric("Card Number", f"**** {stmt.get('card_last_4', 'N/A')}")
-                st.metric("Customer", stmt.get('customer_name', 'N/A'))
-            
-            with col3:
-                period = stmt.get('statement_period', {})
-                st.metric("Statement Period", f"{period.get('from', 'N/A')} to {period.get('to', 'N/A')}")
-                st.metric("Due Date", stmt.get('payment_due_date', 'N/A'))
-            
-            with col4:
-                st.metric("Credit Limit", stmt.get('credit_limit', 'N/A'))
-                st.metric("Available Limit", stmt.get('available_credit_limit', 'N/A'))
-            
-            # Financial Summary
-            st.subheader("💰 Financial Summary")
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                st.metric("Total Amount Due", stmt.get('total_amount_due', 'N/A'))
-            
-            with col2:
-                st.metric("Minimum Amount Due", stmt.get('minimum_amount_due', 'N/A'))
-            
-            with col3:
-                credit_limit_val = parse_amount(stmt.get('credit_limit', '0'))
-                total_due_val = parse_amount(stmt.get('total_amount_due', '0'))
-                
-                if credit_limit_val > 0:
-                    utilization = (total_due_val / credit_limit_val) * 100
-                    st.metric("Credit Utilization", f"{utilization:.1f}%")
-                else:
-                    st.metric("Credit Utilization", "N/A")
-            
-            # Insights
-            st.subheader("💡 AI Insights")
-            insights = stmt.get('insights', [])
-            if insights:
-                for i, insight in enumerate(insights, 1):
-                    st.info(f"**{i}.** {insight}")
-            
-            # Category Chart
-            st.subheader("📊 Spending Analysis")
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                fig_category = create_individual_category_chart(stmt)
-                if fig_category:
-                    st.plotly_chart(fig_category, use_container_width=True)
-            
-            with col2:
-                # Transaction summary
-                transactions = stmt.get('transactions', [])
-                total_txns = len(transactions)
-                debit_txns = len([t for t in transactions if t.get('type', '').lower() == 'debit'])
-                credit_txns = len([t for t in transactions if t.get('type', '').lower() == 'credit'])
-                
-                st.metric("Total Transactions", total_txns)
-                st.metric("Debit Transactions", debit_txns)
-                st.metric("Credit Transactions", credit_txns)
-            
-            # Transactions Table
-            st.subheader("📝 All Transactions")
-            if transactions:
-                df_txns = pd.DataFrame(transactions)
-                st.dataframe(
-                    df_txns,
-                    use_container_width=True,
-                    hide_index=True,
-                    column_config={
-                        "date": st.column_config.TextColumn("Date", width="medium"),
-                        "description": st.column_config.TextColumn("Description", width="large"),
-                        "amount": st.column_config.TextColumn("Amount", width="small"),
-                        "type": st.column_config.TextColumn("Type", width="small"),
-                        "category": st.column_config.TextColumn("Category", width="medium")
-                    }
-                )
+    # Card Information
+    st.subheader("💳 Card Information")
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("Issuer", stmt.get('issuer', 'N/A'))
+        st.metric("Card Type", stmt.get('card_type', 'N/A'))
+    
+    with col2:
+        st.metric("Card Number", f"**** {stmt.get('card_last_4', 'N/A')}")
+        st.metric("Customer", stmt.get('customer_name', 'N/A'))
+    
+    with col3:
+        period = stmt.get('statement_period', {})
+        st.metric("Statement Period", f"{period.get('from', 'N/A')} to {period.get('to', 'N/A')}")
+        st.metric("Due Date", stmt.get('payment_due_date', 'N/A'))
+    
+    with col4:
+        st.metric("Credit Limit", stmt.get('credit_limit', 'N/A'))
+        st.metric("Available Limit", stmt.get('available_credit_limit', 'N/A'))
+    
+    # Financial Summary
+    st.subheader("💰 Financial Summary")
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric("Total Amount Due", stmt.get('total_amount_due', 'N/A'))
+    
+    with col2:
+        st.metric("Minimum Amount Due", stmt.get('minimum_amount_due', 'N/A'))
+    
+    with col3:
+        credit_limit_val = card_summary.at[selected_idx, 'credit_limit']
+        total_due_val = card_summary.at[selected_idx, 'total_due']
+        
+        if credit_limit_val > 0:
+            utilization = (total_due_val / credit_limit_val) * 100
+            st.metric("Credit Utilization", f"{utilization:.1f}%")
+        else:
+            st.metric("Credit Utilization", "N/A")
+    
+    # Insights
+    st.subheader("💡 AI Insights")
+    insights = stmt.get('insights', [])
+    if insights:
+        for i, insight in enumerate(insights, 1):
+            st.info(f"**{i}.** {insight}")
+    
+    # Category Chart
+    st.subheader("📊 Spending Analysis")
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        fig_category = create_individual_category_chart(cache_key(stmt), stmt)
+        if fig_category:
+            st.plotly_chart(fig_category, use_container_width=True)
+    
+    with col2:
+        # Transaction summary
+        transactions = stmt.get('transactions', [])
+        total_txns = len(transactions)
+        debit_txns = credit_txns = 0
+        for t in transactions:
+            txn_type = t.get('type', '').lower()
+            if txn_type == 'debit':
+                debit_txns += 1
+            elif txn_type == 'credit':
+                credit_txns += 1
+        
+        st.metric("Total Transactions", total_txns)
+        st.metric("Debit Transactions", debit_txns)
+        st.metric("Credit Transactions", credit_txns)
+    
+    # Transactions Table
+    st.subheader("📝 All Transactions")
+    if transactions:
+        df_txns = pd.DataFrame(transactions)
+        # Numeric amounts serialise as Arrow floats instead of arbitrary-length strings
+        if 'amount' in df_txns.columns:
+            df_txns['amount'] = parse_amounts(df_txns['amount'])
+        st.dataframe(
+            df_txns,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "date": st.column_config.TextColumn("Date", width="medium"),
+                "description": st.column_config.TextColumn("Description", width="large"),
+                "amount": st.column_config.NumberColumn("Amount", format="₹%.2f", width="small"),
+                "type": st.column_config.TextColumn("Type", width="small"),
+                "category": st.column_config.TextColumn("Category", width="medium")
+            }
+        )
     
     st.divider()
     
@@ -473,7 +595,7 @@ if st.session_state.all_statements:
     
     with col1:
         # Export all statements as JSON
-        all_data_json = json.dumps(all_statements, indent=2, ensure_ascii=False)
+        all_data_json = orjson.dumps(all_statements, option=orjson.OPT_INDENT_2)
         st.download_button(
             label="📥 Download All (JSON)",
             data=all_data_json,
@@ -484,17 +606,8 @@ if st.session_state.all_statements:
     
     with col2:
         # Export all transactions as CSV
-        all_transactions = []
-        for stmt in all_statements:
-            card_id = f"{stmt.get('issuer', 'Unknown')} *{stmt.get('card_last_4', '****')}"
-            for txn in stmt.get('transactions', []):
-                txn_copy = txn.copy()
-                txn_copy['card'] = card_id
-                all_transactions.append(txn_copy)
-        
-        if all_transactions:
-            df_all_txns = pd.DataFrame(all_transactions)
-            csv_data = df_all_txns.to_csv(index=False, encoding='utf-8')
+        if not df_all_txns.empty:
+            csv_data = df_all_txns.drop(columns='amount_numeric').to_csv(index=False, encoding='utf-8')
             st.download_button(
                 label="📥 Download Transactions (CSV)",
                 data=csv_data,
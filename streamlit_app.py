@@ -7,19 +7,19 @@ import streamlit as st
 import os
 import json
 import pandas as pd
-import matplotlib.pyplot as plt
 import io
+import hashlib
+import importlib
+import tempfile
 from datetime import datetime
+from functools import partial
 import sys
 
-# Add src to path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+# Add src to path once; Streamlit re-executes this module on every rerun
+SRC_DIR = os.path.join(os.path.dirname(__file__), 'src')
+if SRC_DIR not in sys.path:
+    sys.path.append(SRC_DIR)
 
-from src.parsers.hdfc_parser import HDFCParser
-from src.parsers.icici_parser import ICICIParser
-from src.parsers.sbi_parser import SBIParser
-from src.parsers.axis_parser import AxisParser
-from src.parsers.kotak_parser import KotakParser
 from src.utils import detect_bank, categorize_transactions, generate_insights, export_to_json, export_to_csv, export_to_excel
 from src.ocr_gemini import extract_text_with_gemini
 
@@ -61,6 +61,8 @@ st.markdown("""
 # Initialize session state
 if 'parsed_data' not in st.session_state:
     st.session_state.parsed_data = None
+if 'processed_statement' not in st.session_state:
+    st.session_state.processed_statement = None
 
 def main():
     st.markdown('<div class="main-header">💳 Credit Card Statement Parser & Analyzer</div>', unsafe_allow_html=True)
@@ -114,69 +116,129 @@ def show_welcome_screen():
         👈 Upload your statement PDF from the sidebar to begin!
     """)
 
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def ocr_pdf_bytes(pdf_hash, _pdf_bytes):
+    """Run Gemini OCR on in-memory PDF bytes, cached by content hash"""
+    # extract_text_with_gemini takes a path, so only the OCR fallback touches disk
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_file:
+        temp_file.write(_pdf_bytes)
+    try:
+        return extract_text_with_gemini(temp_file.name)
+    finally:
+        os.remove(temp_file.name)
+
+def extract_statement_text(pdf_hash, pdf_bytes):
+    """Get the statement text from the PDF text layer, falling back to Gemini OCR"""
+    import pymupdf
+    
+    # Extract the text layer with PyMuPDF, straight from the uploaded bytes
+    try:
+        with pymupdf.open(stream=pdf_bytes, filetype="pdf") as pdf:
+            text = "".join(page.get_text("text") for page in pdf)
+        
+        # If text extraction fails, use Gemini OCR
+        if not text.strip() or len(text) < 100:
+            st.warning("📷 PDF appears to be scanned. Using AI OCR...")
+            text = ocr_pdf_bytes(pdf_hash, pdf_bytes)
+    except pymupdf.FileDataError:
+        st.warning("📷 Using AI OCR for text extraction...")
+        text = ocr_pdf_bytes(pdf_hash, pdf_bytes)
+    
+    return text
+
+# Parser class per bank, imported on first use from src.parsers.<bank>_parser
+PARSER_CLASSES = {
+    'hdfc': 'HDFCParser',
+    'icici': 'ICICIParser',
+    'sbi': 'SBIParser',
+    'axis': 'AxisParser',
+    'kotak': 'KotakParser'
+}
+
+@st.cache_resource
+def get_parser(bank):
+    """Build the parser for a bank once and reuse it (None if unsupported)"""
+    class_name = PARSER_CLASSES.get(bank)
+    if not class_name:
+        return None
+    module = importlib.import_module(f"src.parsers.{bank}_parser")
+    return getattr(module, class_name)()
+
+@st.cache_data(show_spinner=False)
+def parse_statement(pdf_hash, _text):
+    """Detect the bank and parse the statement text, returning (bank, parsed_data)"""
+    # Keyed on the PDF hash so Streamlit doesn't hash the full statement text
+    bank = detect_bank(_text)
+    
+    parser = get_parser(bank)
+    if not parser:
+        return bank, None
+    
+    parsed_data = parser.parse(_text)
+    
+    # Categorize transactions
+    if 'transactions' in parsed_data:
+        parsed_data['transactions'] = categorize_transactions(parsed_data['transactions'])
+    
+    # Generate insights
+    parsed_data['insights'] = generate_insights(parsed_data)
+    
+    return bank, parsed_data
+
 def process_statement(uploaded_file):
     with st.spinner("🔄 Processing your statement..."):
         try:
-            # Save uploaded file temporarily
-            temp_file_path = f"temp_{uploaded_file.name}"
-            with open(temp_file_path, "wb") as f:
-                f.write(uploaded_file.getbuffer())
+            pdf_bytes = uploaded_file.getvalue()
+            pdf_hash = hashlib.blake2b(pdf_bytes, digest_size=16).hexdigest()
             
-            # Try to extract text using pdfplumber
-            try:
-                import pdfplumber
-                text = ""
-                with pdfplumber.open(temp_file_path) as pdf:
-                    for page in pdf.pages:
-                        text += page.extract_text() or ""
-                
-                # If text extraction fails, use Gemini OCR
-                if not text.strip() or len(text) < 100:
-                    st.warning("📷 PDF appears to be scanned. Using AI OCR...")
-                    text = extract_text_with_gemini(temp_file_path)
-            except:
-                st.warning("📷 Using AI OCR for text extraction...")
-                text = extract_text_with_gemini(temp_file_path)
+            # Reruns for the current statement skip extraction and parsing; only the latest
+            # (pdf_hash, result) pair is kept, repeat uploads hit the parse_statement cache
+            processed = st.session_state.processed_statement
+            if processed is None or processed[0] != pdf_hash:
+                text = extract_statement_text(pdf_hash, pdf_bytes)
+                processed = (pdf_hash, parse_statement(pdf_hash, text))
+                st.session_state.processed_statement = processed
+            bank, parsed_data = processed[1]
             
-            # Detect bank
-            bank = detect_bank(text)
             st.success(f"🏦 Detected Bank: **{bank.upper()}**")
             
-            # Parse based on bank
-            parsers = {
-                'hdfc': HDFCParser(),
-                'icici': ICICIParser(),
-                'sbi': SBIParser(),
-                'axis': AxisParser(),
-                'kotak': KotakParser()
-            }
-            
-            parser = parsers.get(bank)
-            if parser:
-                parsed_data = parser.parse(text)
-                
-                # Categorize transactions
-                if 'transactions' in parsed_data:
-                    parsed_data['transactions'] = categorize_transactions(parsed_data['transactions'])
-                
-                # Generate insights
-                parsed_data['insights'] = generate_insights(parsed_data)
-                
+            if parsed_data is not None:
                 st.session_state.parsed_data = parsed_data
-                display_results(parsed_data)
+                display_results(parsed_data, pdf_hash)
             else:
                 st.error("❌ Bank not supported or could not be detected")
-            
-            # Clean up temp file
-            if os.path.exists(temp_file_path):
-                os.remove(temp_file_path)
                 
         except Exception as e:
             st.error(f"❌ Error processing statement: {str(e)}")
-            if os.path.exists(temp_file_path):
-                os.remove(temp_file_path)
 
-def display_results(data):
+def transactions_frame(transactions):
+    """Build the transactions DataFrame from row dicts or a dict of column lists"""
+    # Columnar input is accepted for forward compatibility only; categorize_transactions
+    # still returns row dicts, and pandas builds new arrays from either shape
+    df = pd.DataFrame(transactions)
+    
+    # Free text as Arrow-backed strings (contiguous, no per-row PyObject); few distinct
+    # values as categoricals: both smaller, and faster to filter and group
+    dtypes = {
+        'description': 'string[pyarrow]',
+        'date': 'string[pyarrow]',
+        'type': 'category',
+        'category': 'category'
+    }
+    return df.astype({col: dtype for col, dtype in dtypes.items() if col in df.columns})
+
+EXPORTERS = {
+    'json': export_to_json,
+    'csv': export_to_csv,
+    'excel': export_to_excel
+}
+
+@st.cache_data(show_spinner=False)
+def export_statement(pdf_hash, export_format, _data):
+    """Serialise parsed data for download, at most once per statement and format"""
+    return EXPORTERS[export_format](_data)
+
+def display_results(data, pdf_hash):
     st.markdown("---")
     st.header("📊 Statement Overview")
     
@@ -208,7 +270,7 @@ def display_results(data):
     st.header("📝 Transactions")
     
     if 'transactions' in data and data['transactions']:
-        df = pd.DataFrame(data['transactions'])
+        df = transactions_frame(data['transactions'])
         
         # Display transaction table
         st.dataframe(df, use_container_width=True, height=400)
@@ -242,31 +304,29 @@ def display_results(data):
     st.markdown("---")
     st.header("📥 Export Data")
     
+    # Exports are generated when a button is clicked, not on every render
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        json_data = export_to_json(data)
         st.download_button(
             label="Download JSON",
-            data=json_data,
+            data=partial(export_statement, pdf_hash, 'json', data),
             file_name=f"statement_{datetime.now().strftime('%Y%m%d')}.json",
             mime="application/json"
         )
     
     with col2:
-        csv_data = export_to_csv(data)
         st.download_button(
             label="Download CSV",
-            data=csv_data,
+            data=partial(export_statement, pdf_hash, 'csv', data),
             file_name=f"statement_{datetime.now().strftime('%Y%m%d')}.csv",
             mime="text/csv"
         )
     
     with col3:
-        excel_data = export_to_excel(data)
         st.download_button(
             label="Download Excel",
-            data=excel_data,
+            data=partial(export_statement, pdf_hash, 'excel', data),
             file_name=f"statement_{datetime.now().strftime('%Y%m%d')}.xlsx",
             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
         )
@@ -275,27 +335,33 @@ def display_analytics(df):
     st.markdown("---")
     st.header("📈 Spending Analytics")
     
-    # Filter only debit transactions for analysis
+    # Filter only debit transactions for analysis ('type' is categorical, so
+    # .str.lower() runs once per distinct value rather than once per row)
     debit_df = df[df['type'].str.lower() == 'debit'].copy()
     
+    # Convert amount to numeric (remove ₹, commas and whitespace in one pass)
+    debit_df['amount_numeric'] = pd.to_numeric(
+        debit_df['amount'].str.replace(r'[₹,\s]', '', regex=True),
+        errors='coerce'
+    )
+    debit_df.dropna(subset=['amount_numeric'], inplace=True)
+    
     if len(debit_df) == 0:
         st.warning("No debit transactions found for analysis")
         return
     
-    # Convert amount to numeric (remove ₹ and commas)
-    debit_df['amount_numeric'] = debit_df['amount'].str.replace('₹', '').str.replace(',', '').astype(float)
+    # Sort by amount once; the top transactions are then just the head of the frame
+    debit_df.sort_values('amount_numeric', ascending=False, kind='stable', inplace=True)
     
     col1, col2 = st.columns(2)
     
     with col1:
         st.subheader("📊 Category-wise Spending")
-        category_spending = debit_df.groupby('category')['amount_numeric'].sum().sort_values(ascending=False)
+        category_spending = debit_df.groupby('category', observed=True, sort=False)['amount_numeric'].sum().sort_values(ascending=False)
         
-        fig, ax = plt.subplots(figsize=(8, 6))
-        colors = plt.cm.Set3(range(len(category_spending)))
-        ax.pie(category_spending, labels=category_spending.index, autopct='%1.1f%%', colors=colors, startangle=90)
-        ax.axis('equal')
-        st.pyplot(fig)
+        # Native chart: rendered client-side by Vega-Lite, no server-side PNG rasterisation
+        # sort=False keeps the largest-first order instead of Vega-Lite's alphabetical axis
+        st.bar_chart(category_spending, x_label='Category', y_label='Amount (₹)', sort=False)
         
         # Display category breakdown
         st.write("**Spending Breakdown:**")
@@ -307,22 +373,17 @@ def display_analytics(df):
         
         # Convert date to datetime
         debit_df['date_parsed'] = pd.to_datetime(debit_df['date'], format='%d-%b-%Y', errors='coerce')
-        daily_spending = debit_df.groupby('date_parsed')['amount_numeric'].sum().sort_index()
+        # groupby(sort=True) already returns the dates in order, no separate sort_index()
+        daily_spending = debit_df.groupby('date_parsed', sort=True)['amount_numeric'].sum()
         
-        fig, ax = plt.subplots(figsize=(8, 6))
-        ax.bar(range(len(daily_spending)), daily_spending.values, color='#1f77b4', alpha=0.7)
-        ax.set_xlabel('Transaction Date')
-        ax.set_ylabel('Amount (₹)')
-        ax.set_title('Daily Spending Pattern')
-        plt.xticks(range(len(daily_spending)), [d.strftime('%d-%b') for d in daily_spending.index], rotation=45, ha='right')
-        plt.tight_layout()
-        st.pyplot(fig)
+        st.write("**Daily Spending Pattern**")
+        st.bar_chart(daily_spending, x_label='Transaction Date', y_label='Amount (₹)', color='#1f77b4')
         
         # Top transactions
         st.write("**Top 5 Transactions:**")
-        top_transactions = debit_df.nlargest(5, 'amount_numeric')[['date', 'description', 'amount']]
-        for idx, row in top_transactions.iterrows():
-            st.write(f"- {row['date']}: {row['description']} - {row['amount']}")
+        top_transactions = debit_df.head(5)
+        for date, description, amount in zip(top_transactions['date'], top_transactions['description'], top_transactions['amount']):
+            st.write(f"- {date}: {description} - {amount}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file